@@ -6,30 +6,44 @@
 
 PROJECT DESCRIPTION:
 This program simulates an online movie ticket booking system using POSIX threads,
-mutex locks, and semaphores to handle concurrent user requests safely.
+atomic operations, and semaphores to handle concurrent user requests safely.
 
 REQUIREMENTS IMPLEMENTED:
 ✓ POSIX threads for concurrent user simulation
-✓ Mutex locks for protecting shared ticket data
+✓ Lock-free atomic operations for protecting shared ticket data
 ✓ Semaphores for controlling concurrent access
 ✓ Dynamic memory allocation based on command-line arguments
 ✓ Thread-safe ticket booking without data loss
 ✓ Proper resource cleanup and thread termination
 
 COMPILATION: gcc -o movie_booking movie_ticket_booking.c -pthread
-USAGE: ./movie_booking <num_users> <num_tickets> <num_shows>
+USAGE: ./movie_booking <num_users> <num_tickets> <num_shows> [tickets_per_user]
 EXAMPLE: ./movie_booking 10 5 3
 
 ================================================================================
 */
 
+#define _GNU_SOURCE         // For usleep() and MAP_ANONYMOUS under -std=c99
+
 #include <stdio.h>          // For input/output operations (printf, fprintf)
 #include <stdlib.h>         // For memory allocation (malloc, free) and exit functions
-#include <pthread.h>        // For POSIX threads (pthread_create, pthread_join, pthread_mutex)
+#include <pthread.h>        // For POSIX threads (pthread_create, pthread_join)
 #include <semaphore.h>      // For semaphore operations (sem_init, sem_wait, sem_post)
-#include <unistd.h>         // For usleep() function to add delays
+#include <unistd.h>         // For usleep() function to add delays, sysconf() for CPU count, write()
 #include <string.h>         // For string operations
+#include <stdarg.h>         // For variable argument lists (tlog)
 #include <time.h>           // For random number generation seeding
+#include <stdint.h>         // For fixed-width integers (uint32_t, uint64_t, uintptr_t)
+#include <limits.h>         // For INT_MAX (batch size limit)
+#include <sys/mman.h>       // For mmap() and munmap() (memory arena)
+#ifdef USE_NUMA
+#include <numa.h>           // For NUMA node placement (build with 'make NUMA=1')
+#include <numaif.h>         // For mbind() and MPOL_BIND
+#endif
+#ifdef __linux__
+#include <linux/futex.h>    // For FUTEX_WAIT_PRIVATE and FUTEX_WAKE_PRIVATE
+#include <sys/syscall.h>    // For syscall(SYS_futex, ...)
+#endif
 
 /*
 ================================================================================
@@ -37,30 +51,40 @@ EXAMPLE: ./movie_booking 10 5 3
 ================================================================================
 */
 
+/*
+ * CACHE LINE SIZE
+ * Size in bytes of one CPU cache line (64 on current x86 and most ARM cores)
+ */
+#define CACHE_LINE_SIZE 64
+
 /*
  * SHOW STRUCTURE
  * Represents a single movie show with its tickets and synchronization
  * This is the SHARED DATA that multiple threads will access concurrently
+ *
+ * ALIGNMENT: Each show is aligned (and padded) to a full cache line, so the
+ *            counters of two different shows never share a line. Otherwise
+ *            users booking different shows would still slow each other down
+ *            ("false sharing")
  */
-typedef struct {
+typedef struct __attribute__((aligned(CACHE_LINE_SIZE))) {
     int show_id;                    // Unique identifier for this show (1, 2, 3, ...)
     int available_tickets;          // Current number of tickets available (CRITICAL SHARED DATA)
+                                   // Only ever read/modified with __atomic builtins, so no
+                                   // lock is needed: booking is a single atomic decrement
     int initial_tickets;            // Original number of tickets (for display purposes)
-    pthread_mutex_t mutex;          // Mutex lock for this specific show
-                                   // Each show has its own mutex to allow concurrent 
-                                   // bookings for different shows while protecting same show data
 } Show;
 
 /*
- * USER THREAD DATA STRUCTURE
- * Contains all information a user thread needs to operate
- * Passed as parameter to each thread function
+ * USER REQUEST DATA STRUCTURE
+ * Contains all information needed to process one user's booking
+ * Handed to a worker thread through the booking request queue
  */
 typedef struct {
-    int user_id;                    // Unique identifier for this user thread
+    int user_id;                    // Unique identifier for this user
     Show *shows;                    // Pointer to array of all shows (shared data)
     int num_shows;                  // Total number of shows available
-    sem_t *semaphore;              // Pointer to the global semaphore
+    int tickets_requested;          // Tickets this user wants to book for the chosen show
 } UserData;
 
 /*
@@ -69,11 +93,42 @@ typedef struct {
 ================================================================================
 */
 
-Show *shows = NULL;                 // Dynamic array of all movie shows
-int total_users = 0;                // Total number of user threads to create
+void *arena = NULL;                 // One mmap'd block holding shows, requests and thread IDs
+size_t arena_size = 0;              // Size of the arena in bytes
+Show *shows = NULL;                 // Dynamic array of all movie shows (in the arena)
+size_t show_stride = sizeof(Show);  // Bytes from one show to the next (a whole page in NUMA builds)
+int total_users = 0;                // Total number of users (booking requests) to simulate
 int total_tickets_per_show = 0;     // Number of tickets per show
 int total_shows = 0;                // Total number of shows
-sem_t global_semaphore;             // Semaphore to control concurrent access
+int tickets_per_user = 1;           // Tickets each user books in one go (batched mode if > 1)
+int free_booking_slots = 0;         // Booking slots left (negative = number of users waiting)
+                                    // Only touched via __atomic builtins
+#ifdef __linux__
+uint32_t slot_handovers = 0;        // Futex word: slots handed to waiting users, not yet taken
+#else
+sem_t slot_handover_semaphore;      // Semaphore that users block on when no booking slot is free
+#endif
+
+UserData *booking_requests = NULL;  // Booking request queue: one entry per user, in arrival order (in the arena)
+pthread_t *worker_threads = NULL;   // IDs of the worker threads (in the arena)
+int next_request = 0;               // Index of the next request a worker will take (atomic)
+sem_t requests_ready;               // Counts arrived requests that workers may take
+
+/*
+ * PER-THREAD LOG BUFFER
+ * Each thread collects one user's log lines here and writes them out with a
+ * single write() call, instead of taking the stdout lock for every printf
+ */
+#define TLOG_BUFFER_SIZE 4096
+__thread char tlog_buffer[TLOG_BUFFER_SIZE];
+__thread size_t tlog_length = 0;
+
+/*
+ * PER-THREAD RANDOM NUMBER GENERATOR STATE
+ * rand() shares one state behind an internal lock, so every user picking a
+ * show would queue on it; each thread keeps its own xorshift state instead
+ */
+__thread uint64_t rng_state = 0;
 
 /*
 ================================================================================
@@ -97,56 +152,376 @@ void print_header() {
     printf("- Total Users: %d\n", total_users);
     printf("- Tickets per Show: %d\n", total_tickets_per_show);
     printf("- Number of Shows: %d\n", total_shows);
+    printf("- Tickets per User: %d\n", tickets_per_user);
     printf("- Concurrent Booking Limit: 3 users at a time\n");
     printf("================================================================\n\n");
 }
 
+/*
+ * FUNCTION: tlog
+ * PURPOSE: printf-style logging into the calling thread's log buffer
+ * PARAMETERS:
+ *   - format, ...: Same as printf
+ * RETURNS: void
+ *
+ * NOTE: Lines that no longer fit in the buffer are truncated
+ */
+void tlog(const char *format, ...) {
+    size_t space = TLOG_BUFFER_SIZE - tlog_length;
+    if (space <= 1) {
+        return;  // Buffer full
+    }
+
+    va_list args;
+    va_start(args, format);
+    int written = vsnprintf(tlog_buffer + tlog_length, space, format, args);
+    va_end(args);
+
+    if (written > 0) {
+        tlog_length += ((size_t)written < space) ? (size_t)written : space - 1;
+    }
+}
+
+/*
+ * FUNCTION: tlog_flush
+ * PURPOSE: Write the calling thread's log buffer to stdout and empty it
+ * PARAMETERS: None
+ * RETURNS: void
+ *
+ * NOTE: A single write() of up to PIPE_BUF bytes is atomic, so one user's
+ *       log lines are never interleaved with another user's
+ */
+void tlog_flush() {
+    size_t offset = 0;
+    while (offset < tlog_length) {
+        ssize_t written = write(STDOUT_FILENO, tlog_buffer + offset, tlog_length - offset);
+        if (written <= 0) {
+            break;  // Nothing sensible to do if stdout is gone
+        }
+        offset += (size_t)written;
+    }
+    tlog_length = 0;
+}
+
+/*
+ * BOOKING PROGRESS LOGGING
+ * Step-by-step booking messages are only compiled in VERBOSE builds
+ * ('make verbose'). Otherwise they cost nothing at run time and only the
+ * final report is printed. The "if (0)" form still type-checks the
+ * arguments (and keeps variables only used for logging from being
+ * reported as unused) but generates no code
+ */
+#ifdef VERBOSE
+#define VLOG(...) tlog(__VA_ARGS__)
+#define VLOG_FLUSH() tlog_flush()
+#else
+#define VLOG(...) do { if (0) tlog(__VA_ARGS__); } while (0)
+#define VLOG_FLUSH() ((void)0)
+#endif
+
+/*
+ * FUNCTION: xrand_seed
+ * PURPOSE: Seed the calling thread's random number generator
+ * PARAMETERS: None
+ * RETURNS: void
+ *
+ * NOTE: Mixes the current time with the address of this thread's own
+ *       rng_state, which differs between threads, so every thread gets a
+ *       different sequence on every run
+ */
+void xrand_seed() {
+    uint64_t seed = (uint64_t)time(NULL) ^ (uint64_t)(uintptr_t)&rng_state;
+
+    // splitmix64 finalizer: spreads the seed bits (xorshift needs a non-zero state)
+    seed += 0x9E3779B97F4A7C15ULL;
+    seed = (seed ^ (seed >> 30)) * 0xBF58476D1CE4E5B9ULL;
+    seed = (seed ^ (seed >> 27)) * 0x94D049BB133111EBULL;
+    seed ^= seed >> 31;
+
+    rng_state = (seed != 0) ? seed : 0x9E3779B97F4A7C15ULL;
+}
+
+/*
+ * FUNCTION: xrand
+ * PURPOSE: Lock-free per-thread random number (xorshift64)
+ * PARAMETERS: None
+ * RETURNS: 32 pseudo-random bits
+ */
+uint32_t xrand() {
+    rng_state ^= rng_state << 13;
+    rng_state ^= rng_state >> 7;
+    rng_state ^= rng_state << 17;
+    return (uint32_t)(rng_state >> 32);
+}
+
+/*
+ * FUNCTION: cpu_relax
+ * PURPOSE: Tell the CPU we are busy-waiting (inside a retry/spin loop)
+ * PARAMETERS: None
+ * RETURNS: void
+ *
+ * NOTE: On x86 this is the PAUSE instruction: it saves power, gives the
+ *       other hyperthread on the same core more room and avoids a pipeline
+ *       flush when the loop exits. ARM has YIELD for the same purpose
+ */
+void cpu_relax() {
+#if defined(__x86_64__) || defined(__i386__)
+    __builtin_ia32_pause();
+#elif defined(__aarch64__) || defined(__arm__)
+    __asm__ __volatile__("yield");
+#endif
+}
+
+/*
+ * FUNCTION: wait_for_slot_handover
+ * PURPOSE: Sleep until a user releasing a booking slot hands it over
+ * PARAMETERS: None
+ * RETURNS: void
+ *
+ * LINUX: Sleeps directly on the 32-bit slot_handovers word with
+ *        FUTEX_WAIT_PRIVATE - no sem_t bookkeeping, and the private futex
+ *        skips the kernel's process-shared lookup. The kernel only puts the
+ *        thread to sleep if the word is still 0, so a wake-up cannot be missed
+ * OTHER SYSTEMS: Falls back to a POSIX semaphore
+ */
+void wait_for_slot_handover() {
+#ifdef __linux__
+    while (1) {
+        uint32_t handovers = __atomic_load_n(&slot_handovers, __ATOMIC_ACQUIRE);
+        if (handovers > 0) {
+            // Take one handed-over slot
+            if (__atomic_compare_exchange_n(&slot_handovers, &handovers, handovers - 1,
+                                            0, __ATOMIC_ACQUIRE, __ATOMIC_RELAXED)) {
+                return;
+            }
+            cpu_relax();
+            continue;  // Another waiter took it first - look again
+        }
+        syscall(SYS_futex, &slot_handovers, FUTEX_WAIT_PRIVATE, 0, NULL, NULL, 0);
+    }
+#else
+    sem_wait(&slot_handover_semaphore);
+#endif
+}
+
+/*
+ * FUNCTION: hand_over_slot
+ * PURPOSE: Pass a released booking slot to one sleeping user and wake it
+ * PARAMETERS: None
+ * RETURNS: void
+ */
+void hand_over_slot() {
+#ifdef __linux__
+    __atomic_fetch_add(&slot_handovers, 1, __ATOMIC_RELEASE);
+    syscall(SYS_futex, &slot_handovers, FUTEX_WAKE_PRIVATE, 1, NULL, NULL, 0);
+#else
+    sem_post(&slot_handover_semaphore);
+#endif
+}
+
+/*
+ * FUNCTION: acquire_booking_slot
+ * PURPOSE: Take one of the concurrent booking slots, waiting if none is free
+ * PARAMETERS: None
+ * RETURNS: void
+ *
+ * FAST PATH: If a slot is free, a single atomic decrement claims it and no
+ *            system call is made
+ * SLOW PATH: If no slot is free, the counter goes negative (one per waiting
+ *            user) and the user sleeps until a slot is handed over
+ */
+void acquire_booking_slot() {
+    if (__atomic_fetch_sub(&free_booking_slots, 1, __ATOMIC_ACQUIRE) <= 0) {
+        wait_for_slot_handover();
+    }
+}
+
+/*
+ * FUNCTION: release_booking_slot
+ * PURPOSE: Give a booking slot back, waking one waiting user if there is one
+ * PARAMETERS: None
+ * RETURNS: void
+ */
+void release_booking_slot() {
+    if (__atomic_fetch_add(&free_booking_slots, 1, __ATOMIC_RELEASE) < 0) {
+        hand_over_slot();
+    }
+}
+
+/*
+ * FUNCTION: show_available_tickets
+ * PURPOSE: Read a show's available ticket count
+ * PARAMETERS:
+ *   - show: Pointer to the show
+ * RETURNS: Number of tickets left (never negative)
+ *
+ * NOTE: A failed booking briefly drives the counter below zero before undoing
+ *       it (see book_ticket), so negative values are reported as 0
+ */
+int show_available_tickets(Show *show) {
+    int available = __atomic_load_n(&show->available_tickets, __ATOMIC_ACQUIRE);
+    return available > 0 ? available : 0;
+}
+
+/*
+ * FUNCTION: show_at
+ * PURPOSE: Get a show by its index in the show array
+ * PARAMETERS:
+ *   - index: Show index (0 to total_shows - 1)
+ * RETURNS: Pointer to the show
+ *
+ * NOTE: Shows are show_stride bytes apart rather than sizeof(Show), so NUMA
+ *       builds can give every show a page of its own (see allocate_arena)
+ */
+Show *show_at(int index) {
+    return (Show *)((char *)shows + (size_t)index * show_stride);
+}
+
+/*
+ * FUNCTION: allocate_arena
+ * PURPOSE: Allocate the show array, request queue and thread IDs in one block
+ * PARAMETERS:
+ *   - num_shows: Number of shows
+ *   - num_users: Number of booking requests
+ *   - num_workers: Number of worker threads
+ * RETURNS: void
+ *
+ * MEMORY MANAGEMENT: All three arrays live exactly as long as the program, so
+ *                    they are carved out of a single mmap() instead of three
+ *                    malloc() calls, and released with a single munmap().
+ *                    mmap() memory is page aligned, so the shows (placed first)
+ *                    start on a cache line boundary, and it is zero-filled.
+ * NUMA: Memory is bound to a NUMA node one whole page at a time, so NUMA
+ *       builds space the shows one page apart (show_stride). The page size is
+ *       read at run time - it is 16 KB or 64 KB on some ARM machines
+ */
+void allocate_arena(int num_shows, int num_users, int num_workers) {
+#ifdef USE_NUMA
+    show_stride = (size_t)sysconf(_SC_PAGESIZE);
+#endif
+    size_t shows_size = (size_t)num_shows * show_stride;         // Multiple of CACHE_LINE_SIZE
+    size_t requests_size = (size_t)num_users * sizeof(UserData); // Keeps pointer alignment
+    size_t threads_size = (size_t)num_workers * sizeof(pthread_t);
+
+    arena_size = shows_size + requests_size + threads_size;
+    arena = mmap(NULL, arena_size, PROT_READ | PROT_WRITE, MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+
+    // ERROR HANDLING: Check if memory allocation failed
+    if (arena == MAP_FAILED) {
+        fprintf(stderr, "❌ CRITICAL ERROR: Memory allocation failed\n");
+        fprintf(stderr, "   Requested: %d shows, %d users, %d workers (%zu bytes)\n",
+                num_shows, num_users, num_workers, arena_size);
+        arena = NULL;
+        arena_size = 0;
+        return;
+    }
+
+    shows = (Show *)arena;
+    booking_requests = (UserData *)((char *)arena + shows_size);
+    worker_threads = (pthread_t *)((char *)arena + shows_size + requests_size);
+}
+
+/*
+ * FUNCTION: book_batch
+ * PURPOSE: Atomically reserve up to 'requested' tickets of a show
+ * PARAMETERS:
+ *   - show: Show to book
+ *   - requested: Number of tickets wanted (1 for a normal booking)
+ * RETURNS: Number of tickets actually reserved: min(requested, available)
+ *
+ * SYNCHRONIZATION: One __atomic_fetch_sub covers the whole batch, so booking
+ *                  N tickets costs one atomic operation instead of N.
+ *                  __atomic_fetch_sub returns the value BEFORE the decrement;
+ *                  if fewer than 'requested' tickets were left, the overdraft
+ *                  is given back with __atomic_fetch_add. A negative counter
+ *                  therefore always means "0 tickets left"
+ *
+ * LIMITS: Each booker holding a slot can push the counter at most 'requested'
+ *         below zero, so main() keeps tickets_per_user <= INT_MAX / slots
+ */
+int book_batch(Show *show, int requested) {
+    int prev = __atomic_fetch_sub(&show->available_tickets, requested, __ATOMIC_ACQ_REL);
+    int taken = (prev >= requested) ? requested : (prev > 0 ? prev : 0);
+
+    if (taken < requested) {
+        // Not enough tickets - give back the part we could not take
+        __atomic_fetch_add(&show->available_tickets, requested - taken, __ATOMIC_RELAXED);
+    }
+
+    return taken;
+}
+
+/*
+ * FUNCTION: place_shows_on_numa_nodes
+ * PURPOSE: Spread the shows round-robin over the machine's NUMA nodes
+ * PARAMETERS:
+ *   - num_shows: Number of shows
+ * RETURNS: void
+ *
+ * NOTE: Show i is bound to node i % nodes. Every show has a page of its own
+ *       in NUMA builds (see allocate_arena), so each bind covers exactly one
+ *       show. Must run before the shows are first written (initialize_shows),
+ *       since that is when their pages are actually allocated. Only does
+ *       anything in NUMA builds on a system with NUMA support; otherwise
+ *       memory stays wherever the kernel puts it
+ */
+void place_shows_on_numa_nodes(int num_shows) {
+#ifdef USE_NUMA
+    if (numa_available() < 0) {
+        printf("ℹ️  NUMA not available - using default memory placement\n\n");
+        return;
+    }
+
+    int nodes = numa_num_configured_nodes();
+    struct bitmask *node_mask = numa_allocate_nodemask();
+
+    for (int i = 0; i < num_shows; i++) {
+        int node = i % nodes;
+        numa_bitmask_clearall(node_mask);
+        numa_bitmask_setbit(node_mask, node);
+
+        if (mbind(show_at(i), show_stride, MPOL_BIND,
+                  node_mask->maskp, node_mask->size + 1, 0) != 0) {
+            // ERROR HANDLING: Undo the binds already made, so that all shows
+            // really do end up with the default placement
+            mbind(shows, (size_t)num_shows * show_stride, MPOL_DEFAULT, NULL, 0, 0);
+            fprintf(stderr, "⚠️  WARNING: Could not bind Show %d to NUMA node %d - using default memory placement\n\n",
+                    i + 1, node);
+            numa_free_nodemask(node_mask);
+            return;
+        }
+    }
+
+    numa_free_nodemask(node_mask);
+    printf("🧭 Spread %d shows round-robin over %d NUMA node(s) (one %zu-byte page each)\n\n",
+           num_shows, nodes, show_stride);
+#else
+    (void)num_shows;
+#endif
+}
+
 /*
  * FUNCTION: initialize_shows
- * PURPOSE: Dynamically allocate and initialize all movie shows
+ * PURPOSE: Initialize all movie shows
  * PARAMETERS: 
  *   - num_shows: Number of shows to create
  *   - tickets_per_show: Initial tickets for each show
  * RETURNS: void
  * 
- * MEMORY MANAGEMENT: Uses malloc() to allocate show array dynamically
- * SYNCHRONIZATION: Initializes mutex for each show
+ * MEMORY MANAGEMENT: The show array is already allocated by allocate_arena()
+ * SYNCHRONIZATION: None needed - ticket counters are updated atomically
  */
 void initialize_shows(int num_shows, int tickets_per_show) {
     printf("🎬 Initializing %d shows with %d tickets each...\n", num_shows, tickets_per_show);
 
-    // DYNAMIC MEMORY ALLOCATION
-    // Allocate memory for array of Show structures
-    shows = (Show *)malloc(num_shows * sizeof(Show));
-
-    // ERROR HANDLING: Check if memory allocation failed
-    if (shows == NULL) {
-        fprintf(stderr, "❌ CRITICAL ERROR: Memory allocation failed for shows\n");
-        fprintf(stderr, "   Requested: %d shows (%zu bytes)\n", 
-                num_shows, num_shows * sizeof(Show));
-        exit(EXIT_FAILURE);
-    }
-
     // Initialize each show
     for (int i = 0; i < num_shows; i++) {
-        shows[i].show_id = i + 1;                    // Show IDs start from 1
-        shows[i].available_tickets = tickets_per_show; // Set initial ticket count
-        shows[i].initial_tickets = tickets_per_show;   // Remember original count
-
-        // MUTEX INITIALIZATION
-        // Each show gets its own mutex for fine-grained locking
-        int mutex_result = pthread_mutex_init(&shows[i].mutex, NULL);
-        if (mutex_result != 0) {
-            fprintf(stderr, "❌ ERROR: Failed to initialize mutex for Show %d\n", i + 1);
-            // Clean up already initialized mutexes
-            for (int j = 0; j < i; j++) {
-                pthread_mutex_destroy(&shows[j].mutex);
-            }
-            free(shows);
-            exit(EXIT_FAILURE);
-        }
+        Show *show = show_at(i);
+        show->show_id = i + 1;                    // Show IDs start from 1
+        show->available_tickets = tickets_per_show; // Set initial ticket count
+        show->initial_tickets = tickets_per_show;   // Remember original count
 
-        printf("   ✓ Show %d: %d tickets available\n", shows[i].show_id, shows[i].available_tickets);
+        printf("   ✓ Show %d: %d tickets available\n", show->show_id, show_available_tickets(show));
     }
 
     printf("✅ All shows initialized successfully!\n\n");
@@ -166,9 +541,10 @@ void display_show_status(int user_id) {
     printf("├─────────┼──────────────┼─────────────┤\n");
 
     for (int i = 0; i < total_shows; i++) {
-        int booked = shows[i].initial_tickets - shows[i].available_tickets;
+        int available = show_available_tickets(show_at(i));
+        int booked = show_at(i)->initial_tickets - available;
         printf("│   %2d    │     %2d       │     %2d      │\n", 
-               shows[i].show_id, shows[i].available_tickets, booked);
+               show_at(i)->show_id, available, booked);
     }
 
     printf("└─────────┴──────────────┴─────────────┘\n\n");
@@ -182,27 +558,29 @@ void display_show_status(int user_id) {
 
 /*
  * FUNCTION: book_ticket
- * PURPOSE: Main thread function that simulates a user booking a ticket
+ * PURPOSE: Simulate one user booking a ticket (run by a worker thread)
  * PARAMETERS: 
- *   - arg: Pointer to UserData structure containing thread information
- * RETURNS: NULL (as required by pthread function signature)
+ *   - user_data: Pointer to UserData structure describing the user's request
+ * RETURNS: void
  * 
- * THREAD SAFETY: Uses semaphore and mutex for synchronization
- * CRITICAL SECTION: The ticket checking and decrementing operation
+ * THREAD SAFETY: Uses booking slots and atomic operations for synchronization
+ * CRITICAL OPERATION: The atomic ticket decrement
+ * OUTPUT: Logged with VLOG() (only in VERBOSE builds) and written out in one
+ *         piece when the booking ends
  */
-void* book_ticket(void *arg) {
-    // CAST the void pointer back to UserData pointer
-    UserData *user_data = (UserData *)arg;
+void book_ticket(UserData *user_data) {
     int user_id = user_data->user_id;
 
-    printf("🧑‍💻 User %d: Starting booking process...\n", user_id);
+    VLOG("🧑‍💻 User %d: Starting booking process...\n", user_id);
 
     // RANDOM SHOW SELECTION
     // Simulate user choosing a show randomly
-    int selected_show_index = rand() % user_data->num_shows;
-    int selected_show_id = shows[selected_show_index].show_id;
+    // Maps 32 random bits onto [0, num_shows) with a multiply and shift
+    // instead of a division (Lemire's fast range reduction)
+    int selected_show_index = (int)(((uint64_t)xrand() * (uint32_t)user_data->num_shows) >> 32);
+    int selected_show_id = show_at(selected_show_index)->show_id;
 
-    printf("🎯 User %d: Selected Show %d for booking\n", user_id, selected_show_id);
+    VLOG("🎯 User %d: Selected Show %d for booking\n", user_id, selected_show_id);
 
     /*
     ============================================================================
@@ -210,91 +588,99 @@ void* book_ticket(void *arg) {
     ============================================================================
     */
 
-    // STEP 1: SEMAPHORE WAIT
+    // STEP 1: BOOKING SLOT WAIT
     // This controls the overall number of concurrent bookings
     // If 3 users are already booking, this user will wait here
-    printf("⏳ User %d: Waiting for booking slot (semaphore)...\n", user_id);
-    sem_wait(user_data->semaphore);
-    printf("✅ User %d: Got booking slot! Proceeding to book Show %d\n", user_id, selected_show_id);
-
-    // STEP 2: MUTEX LOCK
-    // Lock the specific show's mutex to enter critical section
-    // Only one thread can modify this show's data at a time
-    printf("🔒 User %d: Locking Show %d mutex...\n", user_id, selected_show_id);
-    pthread_mutex_lock(&shows[selected_show_index].mutex);
-    printf("✅ User %d: Acquired Show %d mutex lock\n", user_id, selected_show_id);
+    VLOG("⏳ User %d: Waiting for booking slot...\n", user_id);
+    acquire_booking_slot();
+    VLOG("✅ User %d: Got booking slot! Proceeding to book Show %d\n", user_id, selected_show_id);
 
-    /*
-    ============================================================================
-                              CRITICAL SECTION
-    ============================================================================
-    This is the most important part - only one thread can execute this
-    section for each show at any given time. This prevents race conditions.
-    */
+    // STEP 2: LOCK-FREE TICKET RESERVATION
+    // Checking and decrementing the ticket count is ONE atomic instruction
+    // (LOCK XADD on x86), so no lock is needed and users never block here.
+    // book_batch() reserves all requested tickets at once, or as many as are left
+    Show *show = show_at(selected_show_index);
+    int requested = user_data->tickets_requested;
 
-    // STEP 3: CHECK TICKET AVAILABILITY AND BOOK
-    printf("🔍 User %d: Checking ticket availability for Show %d...\n", user_id, selected_show_id);
+    VLOG("🔍 User %d: Checking ticket availability for Show %d...\n", user_id, selected_show_id);
+    int taken = book_batch(show, requested);
 
-    if (shows[selected_show_index].available_tickets > 0) {
-        // TICKETS AVAILABLE - PROCEED WITH BOOKING
+    if (taken > 0) {
+        // TICKETS RESERVED - PROCEED WITH BOOKING
 
-        // Display current status before booking
-        printf("✅ User %d: Found %d tickets available for Show %d\n", 
-               user_id, shows[selected_show_index].available_tickets, selected_show_id);
+        // Display what was reserved before booking
+        VLOG("✅ User %d: Reserved %d of %d requested tickets for Show %d\n",
+               user_id, taken, requested, selected_show_id);
 
         // SIMULATE BOOKING PROCESS TIME
         // In real system, this would be database operations, payment processing, etc.
-        printf("💳 User %d: Processing booking for Show %d...\n", user_id, selected_show_id);
+        // The tickets are already reserved, so other users are not held up meanwhile
+        VLOG("💳 User %d: Processing booking for Show %d...\n", user_id, selected_show_id);
         usleep(100000); // 0.1 second delay to simulate booking time
 
-        // DECREMENT TICKET COUNT (THE CRITICAL OPERATION)
-        shows[selected_show_index].available_tickets--;
-
         // BOOKING SUCCESS
-        printf("🎉 User %d: ✅ BOOKING SUCCESSFUL for Show %d!\n", user_id, selected_show_id);
-        printf("📊 User %d: Show %d now has %d tickets remaining\n", 
-               user_id, selected_show_id, shows[selected_show_index].available_tickets);
+        VLOG("🎉 User %d: ✅ BOOKING SUCCESSFUL for Show %d!\n", user_id, selected_show_id);
+        VLOG("📊 User %d: Show %d now has %d tickets remaining\n",
+               user_id, selected_show_id, show_available_tickets(show));
 
     } else {
         // NO TICKETS AVAILABLE
-        printf("❌ User %d: 😞 SOLD OUT! Show %d has no tickets available\n", 
+        VLOG("❌ User %d: 😞 SOLD OUT! Show %d has no tickets available\n", 
                user_id, selected_show_id);
-        printf("💔 User %d: Better luck next time!\n", user_id);
+        VLOG("💔 User %d: Better luck next time!\n", user_id);
     }
 
+    // STEP 3: BOOKING SLOT RELEASE
+    // Allow another user to start booking
+    VLOG("📢 User %d: Releasing booking slot...\n", user_id);
+    release_booking_slot();
+    VLOG("✅ User %d: Booking slot released for next user\n", user_id);
+
     /*
     ============================================================================
-                         END OF CRITICAL SECTION
+                           SYNCHRONIZATION COMPLETE
     ============================================================================
     */
 
-    // STEP 4: MUTEX UNLOCK
-    // Release the show's mutex lock
-    printf("🔓 User %d: Releasing Show %d mutex lock...\n", user_id, selected_show_id);
-    pthread_mutex_unlock(&shows[selected_show_index].mutex);
-    printf("✅ User %d: Show %d mutex released\n", user_id, selected_show_id);
+    VLOG("👋 User %d: Booking process completed.\n\n", user_id);
 
-    // STEP 5: SEMAPHORE POST
-    // Signal the semaphore to allow another user to start booking
-    printf("📢 User %d: Releasing booking slot (semaphore)...\n", user_id);
-    sem_post(user_data->semaphore);
-    printf("✅ User %d: Booking slot released for next user\n", user_id);
+    // OUTPUT
+    // Emit this user's whole log in one write()
+    VLOG_FLUSH();
+}
 
-    /*
-    ============================================================================
-                           SYNCHRONIZATION COMPLETE
-    ============================================================================
-    */
+/*
+ * FUNCTION: booking_worker
+ * PURPOSE: Worker thread function - processes booking requests from the queue
+ * PARAMETERS:
+ *   - arg: Unused
+ * RETURNS: NULL (as required by pthread function signature)
+ *
+ * THREAD POOL: A fixed number of workers is created once and each one handles
+ *              many users, instead of creating and destroying a thread per user.
+ *              Each sem_wait() success lets the worker take exactly one request;
+ *              an index past the last user means the queue is closed.
+ */
+void* booking_worker(void *arg) {
+    (void)arg;
 
-    printf("👋 User %d: Booking process completed. Thread terminating.\n\n", user_id);
+    // Every worker has its own random number generator for picking shows
+    xrand_seed();
+
+    while (1) {
+        // Sleep until a user has arrived (or the queue is closed)
+        sem_wait(&requests_ready);
+
+        // Take the next request - an atomic increment, so no two workers get the same one
+        int index = __atomic_fetch_add(&next_request, 1, __ATOMIC_RELAXED);
+        if (index >= total_users) {
+            break;  // No more users: shut this worker down
+        }
 
-    // MEMORY CLEANUP
-    // Free the UserData structure that was allocated for this thread
-    free(user_data);
+        book_ticket(&booking_requests[index]);
+    }
 
-    // THREAD TERMINATION
-    // Properly exit the thread
-    pthread_exit(NULL);
+    return NULL;
 }
 
 /*
@@ -314,23 +700,24 @@ void* book_ticket(void *arg) {
 void cleanup_resources() {
     printf("🧹 Cleaning up system resources...\n");
 
-    if (shows != NULL) {
-        // DESTROY ALL MUTEXES
-        // Each show's mutex must be properly destroyed
-        for (int i = 0; i < total_shows; i++) {
-            printf("   🗑️  Destroying mutex for Show %d\n", shows[i].show_id);
-            pthread_mutex_destroy(&shows[i].mutex);
-        }
-
+    if (arena != NULL) {
         // FREE DYNAMIC MEMORY
-        printf("   🗑️  Freeing shows memory\n");
-        free(shows);
+        // Shows, booking requests and thread IDs all go with one munmap()
+        printf("   🗑️  Freeing shows, requests and threads memory\n");
+        munmap(arena, arena_size);
+        arena = NULL;
+        arena_size = 0;
         shows = NULL;
+        booking_requests = NULL;
+        worker_threads = NULL;
     }
 
-    // DESTROY SEMAPHORE
-    printf("   🗑️  Destroying semaphore\n");
-    sem_destroy(&global_semaphore);
+    // DESTROY SEMAPHORES
+    printf("   🗑️  Destroying semaphores\n");
+#ifndef __linux__
+    sem_destroy(&slot_handover_semaphore);
+#endif
+    sem_destroy(&requests_ready);
 
     printf("✅ All resources cleaned up successfully!\n");
 }
@@ -356,16 +743,17 @@ void display_final_status() {
     printf("├─────────┼─────────────┼─────────────┼──────────────┤\n");
 
     for (int i = 0; i < total_shows; i++) {
-        int booked = shows[i].initial_tickets - shows[i].available_tickets;
+        int available = show_available_tickets(show_at(i));
+        int booked = show_at(i)->initial_tickets - available;
 
         printf("│   %2d    │     %2d      │     %2d      │     %2d       │\n",
-               shows[i].show_id, 
-               shows[i].initial_tickets,
-               shows[i].available_tickets, 
+               show_at(i)->show_id, 
+               show_at(i)->initial_tickets,
+               available, 
                booked);
 
-        total_initial_tickets += shows[i].initial_tickets;
-        total_remaining_tickets += shows[i].available_tickets;
+        total_initial_tickets += show_at(i)->initial_tickets;
+        total_remaining_tickets += available;
         total_booked_tickets += booked;
     }
 
@@ -379,8 +767,11 @@ void display_final_status() {
     printf("   👥 Total Users: %d\n", total_users);
     printf("   🎫 Total Tickets Available: %d\n", total_initial_tickets);
     printf("   ✅ Total Tickets Booked: %d\n", total_booked_tickets);
+    // users x tickets_per_user can exceed INT_MAX, so count it in a long long
+    long long total_requested_tickets = (long long)total_users * tickets_per_user;
+    printf("   🙋 Total Tickets Requested: %lld\n", total_requested_tickets);
     printf("   📊 Booking Success Rate: %.1f%%\n", 
-           (total_booked_tickets * 100.0) / total_users);
+           (total_booked_tickets * 100.0) / total_requested_tickets);
 
     if (total_remaining_tickets == 0) {
         printf("   🎉 ALL SHOWS SOLD OUT!\n");
@@ -405,15 +796,16 @@ int main(int argc, char *argv[]) {
     */
 
     // CHECK ARGUMENT COUNT
-    // Program expects: ./program_name <users> <tickets> <shows>
-    if (argc != 4) {
+    // Program expects: ./program_name <users> <tickets> <shows> [tickets_per_user]
+    if (argc != 4 && argc != 5) {
         fprintf(stderr, "❌ USAGE ERROR: Incorrect number of arguments\n");
         fprintf(stderr, "\n📋 CORRECT USAGE:\n");
-        fprintf(stderr, "   %s <num_users> <num_tickets> <num_shows>\n\n", argv[0]);
+        fprintf(stderr, "   %s <num_users> <num_tickets> <num_shows> [tickets_per_user]\n\n", argv[0]);
         fprintf(stderr, "📝 EXAMPLES:\n");
         fprintf(stderr, "   %s 5 10 2    # 5 users, 10 tickets per show, 2 shows\n", argv[0]);
         fprintf(stderr, "   %s 20 15 3   # 20 users, 15 tickets per show, 3 shows\n", argv[0]);
         fprintf(stderr, "   %s 50 25 5   # 50 users, 25 tickets per show, 5 shows\n", argv[0]);
+        fprintf(stderr, "   %s 50 20 5 4 # Same, but each user books 4 tickets at once\n", argv[0]);
         exit(EXIT_FAILURE);
     }
 
@@ -421,14 +813,25 @@ int main(int argc, char *argv[]) {
     total_users = atoi(argv[1]);                    // Convert string to integer
     total_tickets_per_show = atoi(argv[2]);
     total_shows = atoi(argv[3]);
+    if (argc == 5) {
+        tickets_per_user = atoi(argv[4]);           // Optional: batched booking
+    }
 
     // VALIDATE ARGUMENTS
     // All arguments must be positive integers
-    if (total_users <= 0 || total_tickets_per_show <= 0 || total_shows <= 0) {
+    if (total_users <= 0 || total_tickets_per_show <= 0 || total_shows <= 0 || tickets_per_user <= 0) {
         fprintf(stderr, "❌ VALIDATION ERROR: All arguments must be positive integers\n");
         fprintf(stderr, "   Users: %d (must be > 0)\n", total_users);
         fprintf(stderr, "   Tickets per show: %d (must be > 0)\n", total_tickets_per_show);
         fprintf(stderr, "   Number of shows: %d (must be > 0)\n", total_shows);
+        fprintf(stderr, "   Tickets per user: %d (must be > 0)\n", tickets_per_user);
+        exit(EXIT_FAILURE);
+    }
+
+    // A user cannot book more tickets than a show has
+    if (tickets_per_user > total_tickets_per_show) {
+        fprintf(stderr, "❌ VALIDATION ERROR: Tickets per user (%d) exceeds tickets per show (%d)\n",
+                tickets_per_user, total_tickets_per_show);
         exit(EXIT_FAILURE);
     }
 
@@ -446,76 +849,131 @@ int main(int argc, char *argv[]) {
     // DISPLAY SYSTEM INFORMATION
     print_header();
 
-    // SEED RANDOM NUMBER GENERATOR
-    // This ensures different random show selections each time
-    srand(time(NULL));
-
-    // INITIALIZE SEMAPHORE
+    // INITIALIZE BOOKING SLOTS AND SEMAPHORES
     // Limit concurrent bookings to 3 users at a time
     int concurrent_limit = 3;  // You can adjust this value
-    printf("🔧 Initializing semaphore with limit of %d concurrent bookings...\n", concurrent_limit);
 
-    int sem_result = sem_init(&global_semaphore, 0, concurrent_limit);
+    // Every user holding a slot may overdraw a show by up to tickets_per_user
+    // before giving the rest back (see book_batch), so all of those overdrafts
+    // together must still fit in the int ticket counter
+    if (tickets_per_user > INT_MAX / concurrent_limit) {
+        fprintf(stderr, "❌ VALIDATION ERROR: Tickets per user (%d) must be at most %d\n",
+                tickets_per_user, INT_MAX / concurrent_limit);
+        exit(EXIT_FAILURE);
+    }
+    printf("🔧 Initializing booking slots with limit of %d concurrent bookings...\n", concurrent_limit);
+
+    // The free slots are counted atomically; the handover wait is only used
+    // to put users to sleep when every slot is taken
+    free_booking_slots = concurrent_limit;
+#ifndef __linux__
+    int sem_result = sem_init(&slot_handover_semaphore, 0, 0);
     if (sem_result != 0) {
         fprintf(stderr, "❌ CRITICAL ERROR: Failed to initialize semaphore\n");
         exit(EXIT_FAILURE);
     }
-    printf("✅ Semaphore initialized successfully!\n\n");
+#endif
+    if (sem_init(&requests_ready, 0, 0) != 0) {
+        fprintf(stderr, "❌ CRITICAL ERROR: Failed to initialize request queue semaphore\n");
+#ifndef __linux__
+        sem_destroy(&slot_handover_semaphore);
+#endif
+        exit(EXIT_FAILURE);
+    }
+    printf("✅ Booking slots and semaphores initialized successfully!\n\n");
+
+    // POOL SIZE
+    // One worker per CPU core, but at least one per booking slot: bookings
+    // sleep while "processing", so fewer workers would leave slots unused
+    long num_cpus = sysconf(_SC_NPROCESSORS_ONLN);
+    int num_workers = (num_cpus > concurrent_limit) ? (int)num_cpus : concurrent_limit;
+    if (num_workers > total_users) {
+        num_workers = total_users;
+    }
+
+    // ALLOCATE MEMORY
+    // Shows, booking requests and worker thread IDs, all in one block
+    allocate_arena(total_shows, total_users, num_workers);
+    if (arena == NULL) {
+        cleanup_resources();
+        exit(EXIT_FAILURE);
+    }
+
+    // NUMA PLACEMENT (NUMA builds only) - before the shows are first touched
+    place_shows_on_numa_nodes(total_shows);
 
     // INITIALIZE SHOWS
     initialize_shows(total_shows, total_tickets_per_show);
 
     /*
     ============================================================================
-                              THREAD CREATION
+                              BOOKING REQUESTS
     ============================================================================
     */
 
-    printf("👥 Creating %d user threads...\n", total_users);
-
-    // ALLOCATE MEMORY FOR THREAD IDs
-    pthread_t *threads = (pthread_t *)malloc(total_users * sizeof(pthread_t));
-    if (threads == NULL) {
-        fprintf(stderr, "❌ CRITICAL ERROR: Memory allocation failed for thread IDs\n");
-        cleanup_resources();
-        exit(EXIT_FAILURE);
+    // Every user gets one UserData entry in the request queue
+    for (int i = 0; i < total_users; i++) {
+        booking_requests[i].user_id = i + 1;                 // User IDs start from 1
+        booking_requests[i].shows = shows;                   // Pointer to shared show array
+        booking_requests[i].num_shows = total_shows;         // Number of shows available
+        booking_requests[i].tickets_requested = tickets_per_user; // Tickets to book at once
     }
 
-    // CREATE USER THREADS
-    for (int i = 0; i < total_users; i++) {
-        // ALLOCATE MEMORY FOR THREAD DATA
-        // Each thread gets its own UserData structure
-        UserData *user_data = (UserData *)malloc(sizeof(UserData));
-        if (user_data == NULL) {
-            fprintf(stderr, "❌ ERROR: Memory allocation failed for User %d data\n", i + 1);
-            // Continue with other threads rather than failing completely
-            continue;
-        }
+    /*
+    ============================================================================
+                              THREAD POOL CREATION
+    ============================================================================
+    */
 
-        // INITIALIZE THREAD DATA
-        user_data->user_id = i + 1;                    // User IDs start from 1
-        user_data->shows = shows;                      // Pointer to shared show array
-        user_data->num_shows = total_shows;            // Number of shows available
-        user_data->semaphore = &global_semaphore;      // Pointer to global semaphore
+    printf("👥 Creating %d worker threads for %d users...\n", num_workers, total_users);
 
-        // CREATE PTHREAD
-        int thread_result = pthread_create(&threads[i], NULL, book_ticket, (void *)user_data);
+    // CREATE WORKER THREADS
+    int workers_created = 0;
+    for (int i = 0; i < num_workers; i++) {
+        int thread_result = pthread_create(&worker_threads[workers_created], NULL, booking_worker, NULL);
 
         if (thread_result != 0) {
-            fprintf(stderr, "❌ ERROR: Failed to create thread for User %d\n", i + 1);
-            free(user_data);  // Clean up allocated memory
+            fprintf(stderr, "❌ ERROR: Failed to create worker thread %d\n", i + 1);
             continue;
         }
 
-        printf("   ✅ User %d thread created successfully\n", i + 1);
+        workers_created++;
+        printf("   ✅ Worker %d thread created successfully\n", i + 1);
+    }
+
+    if (workers_created == 0) {
+        fprintf(stderr, "❌ CRITICAL ERROR: No worker threads could be created\n");
+        cleanup_resources();
+        exit(EXIT_FAILURE);
+    }
+
+    printf("\n🎬 Worker pool ready! Booking simulation started...\n");
+    printf("================================================================\n\n");
+
+    // Workers write straight to stdout (see tlog_flush), so push out
+    // everything printed so far before they start
+    fflush(stdout);
+
+    /*
+    ============================================================================
+                              USER ARRIVAL
+    ============================================================================
+    */
+
+    // HAND EACH USER'S REQUEST TO THE POOL
+    for (int i = 0; i < total_users; i++) {
+        sem_post(&requests_ready);
 
-        // SMALL DELAY BETWEEN THREAD CREATION
+        // SMALL DELAY BETWEEN ARRIVALS
         // This simulates users arriving at slightly different times
         usleep(50000); // 0.05 second delay
     }
 
-    printf("\n🎬 All user threads created! Booking simulation started...\n");
-    printf("================================================================\n\n");
+    // CLOSE THE QUEUE
+    // One extra post per worker: each worker wakes, finds no request left and exits
+    for (int i = 0; i < workers_created; i++) {
+        sem_post(&requests_ready);
+    }
 
     /*
     ============================================================================
@@ -525,18 +983,18 @@ int main(int argc, char *argv[]) {
 
     printf("⏳ Main thread waiting for all users to complete booking...\n\n");
 
-    // WAIT FOR ALL THREADS TO COMPLETE
+    // WAIT FOR ALL WORKERS TO COMPLETE
     // pthread_join() blocks until the specified thread terminates
-    for (int i = 0; i < total_users; i++) {
-        int join_result = pthread_join(threads[i], NULL);
+    for (int i = 0; i < workers_created; i++) {
+        int join_result = pthread_join(worker_threads[i], NULL);
         if (join_result != 0) {
-            fprintf(stderr, "⚠️  WARNING: Failed to join thread for User %d\n", i + 1);
+            fprintf(stderr, "⚠️  WARNING: Failed to join worker thread %d\n", i + 1);
         } else {
-            printf("✅ User %d thread completed successfully\n", i + 1);
+            printf("✅ Worker %d thread completed successfully\n", i + 1);
         }
     }
 
-    printf("\n🎉 All user threads have completed!\n");
+    printf("\n🎉 All users have completed booking!\n");
 
     /*
     ============================================================================
@@ -548,8 +1006,7 @@ int main(int argc, char *argv[]) {
     display_final_status();
 
     // CLEANUP RESOURCES
-    free(threads);  // Free thread ID array
-    cleanup_resources();  // Clean up shows, mutexes, and semaphore
+    cleanup_resources();  // Clean up shows, requests, thread IDs and semaphores
 
     printf("\n🏁 Star Cineplex Booking System terminated successfully!\n");
     printf("   Thank you for using our ticket booking system!\n\n");
@@ -565,34 +1022,48 @@ int main(int argc, char *argv[]) {
 SYNCHRONIZATION SUMMARY:
 ========================
 
-1. SEMAPHORE (global_semaphore):
+1. BOOKING SLOTS (free_booking_slots):
    - Purpose: Controls the maximum number of concurrent bookings (set to 3)
-   - Operations: sem_wait() to acquire slot, sem_post() to release slot
-   - Benefit: Prevents system overload during peak usage
+   - Operations: acquire_booking_slot() / release_booking_slot(); an atomic
+     counter hands out free slots. Only a user that has to wait for a slot
+     sleeps: on a private futex on Linux, on a semaphore elsewhere
+   - Benefit: Prevents system overload during peak usage, without any
+     system call when a slot is free
 
-2. MUTEX LOCKS (one per show):
+2. ATOMIC TICKET COUNTERS (one per show):
    - Purpose: Protects the ticket count of each individual show
-   - Operations: pthread_mutex_lock() to acquire, pthread_mutex_unlock() to release
-   - Benefit: Prevents race conditions on shared ticket data
-
-3. THREAD SYNCHRONIZATION:
-   - pthread_create(): Creates user threads
-   - pthread_join(): Waits for thread completion
-   - pthread_exit(): Properly terminates threads
-
-CRITICAL SECTION:
-================
-The critical section is the code that checks ticket availability and decrements
-the counter. This MUST be protected by mutex to prevent:
+   - Operations: book_batch() - __atomic_fetch_sub() to reserve one or more
+     tickets, __atomic_fetch_add() to give back what could not be reserved
+   - Benefit: Prevents race conditions on shared ticket data without any lock,
+     so users booking the same show never wait on each other
+
+3. THREAD POOL:
+   - pthread_create(): Creates a fixed pool of worker threads once
+   - requests_ready semaphore: Wakes a worker for each arriving user
+   - __atomic_fetch_add() on next_request: Hands each request to exactly one worker
+   - pthread_join(): Waits for the workers after the queue is closed
+
+4. PER-THREAD OUTPUT BUFFERING:
+   - VLOG() / tlog(): Formats a log line into the calling thread's own buffer
+     (VLOG() compiles to nothing unless built with -DVERBOSE)
+   - tlog_flush(): Writes the buffer to stdout with a single write() call
+   - Benefit: No stdout lock per log line, and one user's lines never
+     interleave with another user's
+
+CRITICAL OPERATION:
+===================
+The critical operation checks ticket availability and decrements the counter.
+It MUST be a single atomic read-modify-write to prevent:
 - Race conditions (multiple threads reading same value)
 - Data corruption (negative ticket counts)
 - Overbooking (selling more tickets than available)
 
 MEMORY MANAGEMENT:
 ==================
-- Dynamic allocation: malloc() for shows, threads, and user data
-- Proper cleanup: free() for all allocated memory
-- Resource destruction: pthread_mutex_destroy(), sem_destroy()
+- Dynamic allocation: one mmap() arena for shows, booking requests and worker
+  thread IDs (page aligned, so every Show starts on a cache line)
+- Proper cleanup: a single munmap() releases the arena
+- Resource destruction: sem_destroy()
 
 ERROR HANDLING:
 ===============
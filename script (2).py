@@ -1,5 +1,19 @@
 # Create a detailed step-by-step execution guide
 
+def write_if_changed(path, content):
+    """Write content to path, leaving the file untouched if it already matches."""
+    try:
+        with open(path) as f:
+            old = f.read()
+    except FileNotFoundError:
+        old = None
+    if old == content:
+        return False
+    with open(path, 'w') as f:
+        f.write(content)
+    return True
+
+
 execution_guide = '''# 🚀 Movie Ticket Booking System - Complete Execution Guide
 
 ## 📋 Table of Contents
@@ -34,9 +48,23 @@ gcc -pthread --help | grep pthread
 # Compile the program
 make
 
+# Compile movie_booking_verbose with step-by-step booking logs
+# (the default build only prints the final report)
+make verbose
+
+# Compile object files in parallel on all CPU cores
+make -j$(nproc)
+
 # Or compile debug version
 make debug
 
+# Or build a profile-guided, link-time optimized version (movie_booking_pgo)
+make pgo-gen && ./movie_booking_pgo 50 20 5 && make pgo-use
+
+# Or, on multi-socket machines, spread the shows over NUMA nodes
+# (needs libnuma, e.g. sudo apt-get install libnuma-dev)
+make clean && make NUMA=1
+
 # View all available options
 make help
 ```
@@ -49,21 +77,22 @@ gcc -o movie_booking movie_ticket_booking_complete.c -pthread
 # With all warnings enabled (recommended)
 gcc -Wall -Wextra -o movie_booking movie_ticket_booking_complete.c -pthread
 
-# Debug version with symbols
-gcc -Wall -Wextra -g -o movie_booking_debug movie_ticket_booking_complete.c -pthread
+# Debug version with symbols and step-by-step booking logs
+gcc -Wall -Wextra -g -DVERBOSE -o movie_booking_debug movie_ticket_booking_complete.c -pthread
 ```
 
 ## 🎮 Basic Execution
 
 ### Command Syntax:
 ```bash
-./movie_booking <number_of_users> <tickets_per_show> <number_of_shows>
+./movie_booking <number_of_users> <tickets_per_show> <number_of_shows> [tickets_per_user]
 ```
 
 ### Parameter Explanation:
-- **number_of_users**: Total user threads to create (1-1000 recommended)
+- **number_of_users**: Total booking requests (one per user) served by the worker pool (1-1000 recommended)
 - **tickets_per_show**: Initial tickets available for each show (1-100 recommended)
 - **number_of_shows**: Total number of movie shows (1-20 recommended)
+- **tickets_per_user** (optional, default 1): Tickets each user books in one go (at most tickets_per_show)
 
 ### Simple Examples:
 ```bash
@@ -91,6 +120,7 @@ System Configuration:
 - Total Users: 10
 - Tickets per Show: 5
 - Number of Shows: 2
+- Tickets per User: 1
 - Concurrent Booking Limit: 3 users at a time
 ================================================================
 ```
@@ -103,32 +133,30 @@ System Configuration:
 ✅ All shows initialized successfully!
 ```
 
-### 3. Thread Creation
+### 3. Thread Pool Creation
 ```
-👥 Creating 10 user threads...
-   ✅ User 1 thread created successfully
-   ✅ User 2 thread created successfully
+👥 Creating 4 worker threads for 10 users...
+   ✅ Worker 1 thread created successfully
+   ✅ Worker 2 thread created successfully
    ...
 ```
+A fixed pool of worker threads (one per CPU core, at least one per booking
+slot) is created once; each arriving user's request is handed to a free worker.
 
-### 4. Booking Process (Real-time)
+### 4. Booking Process (`movie_booking_verbose` and debug builds only; one block per user, printed when the booking finishes)
 ```
 🧑‍💻 User 1: Starting booking process...
 🎯 User 1: Selected Show 2 for booking
-⏳ User 1: Waiting for booking slot (semaphore)...
+⏳ User 1: Waiting for booking slot...
 ✅ User 1: Got booking slot! Proceeding to book Show 2
-🔒 User 1: Locking Show 2 mutex...
-✅ User 1: Acquired Show 2 mutex lock
 🔍 User 1: Checking ticket availability for Show 2...
-✅ User 1: Found 5 tickets available for Show 2
+✅ User 1: Reserved 1 of 1 requested tickets for Show 2
 💳 User 1: Processing booking for Show 2...
 🎉 User 1: ✅ BOOKING SUCCESSFUL for Show 2!
 📊 User 1: Show 2 now has 4 tickets remaining
-🔓 User 1: Releasing Show 2 mutex lock...
-✅ User 1: Show 2 mutex released
-📢 User 1: Releasing booking slot (semaphore)...
+📢 User 1: Releasing booking slot...
 ✅ User 1: Booking slot released for next user
-👋 User 1: Booking process completed. Thread terminating.
+👋 User 1: Booking process completed.
 ```
 
 ### 5. Final Report
@@ -149,6 +177,7 @@ System Configuration:
    👥 Total Users: 10
    🎫 Total Tickets Available: 10
    ✅ Total Tickets Booked: 7
+   🙋 Total Tickets Requested: 10
    📊 Booking Success Rate: 70.0%
 ================================================================
 ```
@@ -183,7 +212,14 @@ System Configuration:
 # Expected: Heavy contention, but no race conditions or crashes
 ```
 
-### Test 5: Edge Cases
+### Test 5: Batched Booking
+```bash
+# Each user books 4 tickets at once (one atomic operation per user)
+./movie_booking 50 20 5 4
+# Expected: Users get 4 tickets, or whatever is left in their show
+```
+
+### Test 6: Edge Cases
 ```bash
 # Single user, single ticket
 ./movie_booking 1 1 1
@@ -234,9 +270,10 @@ chmod +x movie_booking
 
 #### 4. Output Issues
 ```bash
-# Issue: Garbled output (overlapping prints)
+# Issue: Users' messages appear out of arrival order
 # This is normal due to concurrent execution
-# Each thread's output may interleave with others
+# Each user's log is buffered per thread and written in one piece when
+# the booking finishes, so lines of different users never interleave
 ```
 
 ## 📖 Code Walkthrough
@@ -245,61 +282,65 @@ chmod +x movie_booking
 
 #### 1. Data Structures
 ```c
-// Each show has its own mutex for fine-grained locking
-typedef struct {
+// Each show's ticket counter is updated atomically - no lock needed.
+// Each show fills a whole cache line, so different shows never share one
+typedef struct __attribute__((aligned(CACHE_LINE_SIZE))) {
     int show_id;                 // Unique identifier
-    int available_tickets;       // SHARED DATA - protected by mutex
-    pthread_mutex_t mutex;       // Individual lock per show
+    int available_tickets;       // SHARED DATA - only touched via __atomic builtins
 } Show;
 ```
 
 #### 2. Synchronization Flow
 ```c
-// Step 1: Acquire semaphore (limits concurrent access)
-sem_wait(&semaphore);
-
-// Step 2: Lock specific show's mutex
-pthread_mutex_lock(&show.mutex);
-
-// Step 3: CRITICAL SECTION - modify shared data
-if (show.available_tickets > 0) {
-    show.available_tickets--;  // This line MUST be protected
+// Step 1: Acquire a booking slot (limits concurrent access)
+// Atomic fast path; only sleeps (on a futex on Linux) when all slots are taken
+acquire_booking_slot();
+
+// Step 2: CRITICAL OPERATION - reserve the whole batch in ONE atomic step
+int taken = book_batch(&show, requested);   // requested = tickets_per_user
+
+// Inside book_batch():
+int prev = __atomic_fetch_sub(&show->available_tickets, requested, __ATOMIC_ACQ_REL);
+int taken = (prev >= requested) ? requested : (prev > 0 ? prev : 0);
+if (taken < requested) {
+    // Not enough left - give back the part we could not take
+    __atomic_fetch_add(&show->available_tickets, requested - taken, __ATOMIC_RELAXED);
 }
 
-// Step 4: Release in reverse order
-pthread_mutex_unlock(&show.mutex);
-sem_post(&semaphore);
+// Step 3: Release the booking slot (wakes a sleeper only if someone is waiting)
+release_booking_slot();
 ```
 
-#### 3. Why Both Semaphore AND Mutex?
-- **Semaphore**: Controls OVERALL system concurrency (max 3 users booking simultaneously)
-- **Mutex**: Protects INDIVIDUAL show data (prevents race conditions)
+#### 3. Why Both Booking Slots AND Atomic Counters?
+- **Booking slots**: Control OVERALL system concurrency (max 3 users booking simultaneously)
+- **Atomic counter**: Protects INDIVIDUAL show data (prevents race conditions)
 - **Together**: Provide both system-level and data-level protection
 
 #### 4. Memory Management
 ```c
-// Dynamic allocation based on input
-shows = malloc(num_shows * sizeof(Show));
-threads = malloc(num_users * sizeof(pthread_t));
+// Dynamic allocation based on input: one block for everything
+arena = mmap(NULL, shows_size + requests_size + threads_size,
+             PROT_READ | PROT_WRITE, MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+shows = arena;                                  // page aligned
+booking_requests = arena + shows_size;
+worker_threads = arena + shows_size + requests_size;
 
 // Proper cleanup
-free(shows);
-free(threads);
-pthread_mutex_destroy(&mutex);
-sem_destroy(&semaphore);
+munmap(arena, arena_size);
+sem_destroy(&requests_ready);
 ```
 
 ### Critical Success Factors:
-1. **Proper Lock Ordering**: Semaphore → Mutex → Unlock Mutex → Release Semaphore
+1. **Atomic Booking**: Check and decrement the ticket count in one atomic step
 2. **Error Handling**: Check all allocation and initialization calls
-3. **Resource Cleanup**: Destroy all mutexes, free all memory
+3. **Resource Cleanup**: Destroy the semaphores, unmap the memory arena
 4. **Thread Joining**: Wait for all threads before cleanup
 
 ## 🎯 Learning Objectives Achieved
 
 After running this program, you'll understand:
 - ✅ How POSIX threads work in practice
-- ✅ Why mutex locks prevent race conditions  
+- ✅ How atomic operations prevent race conditions  
 - ✅ How semaphores control concurrency
 - ✅ Dynamic memory allocation in multithreaded programs
 - ✅ Proper resource cleanup in concurrent applications
@@ -326,10 +367,10 @@ If you encounter issues:
 Happy coding! 🚀
 '''
 
-with open('EXECUTION_GUIDE.md', 'w') as f:
-    f.write(execution_guide)
-
-print("Created: EXECUTION_GUIDE.md")
+if write_if_changed('EXECUTION_GUIDE.md', execution_guide):
+    print("Created: EXECUTION_GUIDE.md")
+else:
+    print("Unchanged: EXECUTION_GUIDE.md")
 print("\nExecution guide includes:")
 print("- Complete step-by-step instructions")
 print("- Detailed output explanations")